@@ -3,7 +3,7 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
-    TimeoutException, NoSuchElementException)
+    TimeoutException, NoSuchElementException, StaleElementReferenceException)
 from dotenv import load_dotenv
 import os
 import time
@@ -124,77 +124,168 @@ def find_confirmation_text(class_name, text):
         notify_admin(f"Other error checking for the message: {e}")
         raise TemporaryError(f"Message didn't appear: {e}")
 
-def get_buttons(class_name):
-    try:
-        buttons = get_driver().find_elements(By.CLASS_NAME, class_name)
-
-        if not buttons:
-            print("No accept buttons were found")
-            return None
-        
-        print(f"Found {len(buttons)} {class_name} buttons")
-        return buttons
-    
-    except Exception as e:
-        raise TemporaryError(f"Unexpected error during get_buttons(). Error: {e}")    
-
 """
 Accept jobs
 """
-def confirm_job_accept():
+ACCEPT_SUCCESS_TEXT = "Success, you have accepted job"
+ACCEPT_GONE_TEXT = "Accept Job failed. Job is no longer available."
+CONFIRM_TIMEOUT = 45  # Seconds to wait for the confirm dialog
+MESSAGE_TIMEOUT = 30  # Seconds to wait for the outcome message
+
+# Runs the whole accept flow inside the page in one round trip:
+# find the job's row -> click accept -> wait for confirm dialog -> confirm -> read outcome message.
+# Rows are matched on the same " | "-joined cell text parse_jobs() builds.
+# Selenium passes the callback as the last argument.
+ACCEPT_JOB_SCRIPT = """
+const [tableId, jobKey, successText, goneText, confirmMs, messageMs, done] = arguments;
+
+function poll(check, timeoutMs, onFound, onTimeout) {
+    const start = Date.now();
+    const timer = setInterval(() => {
+        let found = null;
+        try { found = check(); } catch (e) { found = null; }
+        if (found) {
+            clearInterval(timer);
+            onFound(found);
+        } else if (Date.now() - start > timeoutMs) {
+            clearInterval(timer);
+            onTimeout();
+        }
+    }, 100);
+}
+
+function isActive(el) {
+    const style = window.getComputedStyle(el);
+    return el.getClientRects().length > 0 && style.visibility !== "hidden"
+        && style.display !== "none" && !el.disabled;
+}
+
+// Close to BeautifulSoup's get_text(strip=True): strip each text node and concatenate,
+// skipping script/style/template text like bs4 does
+function cellText(cell) {
+    const walker = document.createTreeWalker(cell, NodeFilter.SHOW_TEXT, {
+        acceptNode: (node) => ["SCRIPT", "STYLE", "TEMPLATE"].includes(node.parentNode.nodeName)
+            ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT
+    });
+    const parts = [];
+    while (walker.nextNode()) {
+        const text = walker.currentNode.nodeValue.trim();
+        if (text) parts.push(text);
+    }
+    return parts.join("");
+}
+
+const table = document.getElementById(tableId);
+if (!table) {
+    return done({status: "not_found", message: "Job table not found in page"});
+}
+const row = Array.from(table.querySelectorAll("tr")).find(
+    (tr) => Array.from(tr.querySelectorAll("td")).map(cellText).join(" | ") === jobKey
+);
+if (!row) {
+    return done({status: "not_found", message: `No row matches job: ${jobKey}`});
+}
+const button = row.querySelector(".accept-icon");
+if (!button) {
+    return done({status: "no_buttons", message: `Accept button missing for job: ${jobKey}`});
+}
+if (!isActive(button)) {
+    return done({status: "inactive", message: `Accept button for job is not active: ${jobKey}`});
+}
+button.click();
+
+poll(() => {
+    const confirm = document.getElementById("confirm-dialog");
+    return confirm && isActive(confirm) ? confirm : null;
+}, confirmMs, (confirm) => {
+    confirm.click();
+    poll(() => {
+        // Only visible messages count, like Selenium's .text
+        for (const el of document.getElementsByClassName("pds-message-content")) {
+            if (!isActive(el)) continue;
+            const text = el.innerText;
+            if (text.includes(successText)) return {status: "accepted", message: text.trim()};
+            if (text.includes(goneText)) return {status: "gone", message: text.trim()};
+        }
+        return null;
+    }, messageMs, done, () => done({status: "no_message", message: "Message didn't appear"}));
+}, () => done({status: "no_confirm",
+               message: `Confirmation button did not appear within ${confirmMs / 1000} seconds`}));
+"""
+
+def find_accept_outcome(driver):
+    """Returns the accept result if the success/gone message is showing, else False"""
+    for element in driver.find_elements(By.CLASS_NAME, "pds-message-content"):
+        text = element.text
+        if ACCEPT_SUCCESS_TEXT in text:
+            return {"status": "accepted", "message": text.strip()}
+        if ACCEPT_GONE_TEXT in text:
+            return {"status": "gone", "message": text.strip()}
+    return False
+
+def wait_for_accept_outcome():
+    """Finishes the accept flow with WebDriverWait after the page reloaded mid-script"""
+    driver = get_driver()
     try:
-        find_confirmation_text(class_name="pds-message-content", text="Success, you have accepted job ")
-        screenshot_name="accept_confirmed.png"
-        message = "Accept button confirmed"
-        screenshot_and_notify(message, screenshot_name, notify_users)
+        # The reload may have happened after the accept click or after the confirm click
+        found = WebDriverWait(driver, CONFIRM_TIMEOUT, ignored_exceptions=[StaleElementReferenceException]).until(
+            EC.any_of(find_accept_outcome, EC.element_to_be_clickable((By.ID, "confirm-dialog")))
+        )
+        if isinstance(found, dict):
+            return found
 
-    except Exception as e:
-        try:
-            # Check if job was taken
-            find_confirmation_text("pds-message-content", "Accept Job failed. Job is no longer available.")
-            message = "Job is no longer available"
-            screenshot_name = "job_gone.png"
-            screenshot_and_notify(message, screenshot_name, notify_users)
-        except Exception as e:
-            raise TemporaryError(f"Error when checking if job is no longer available: {e}")
-    
-def click_accept(job_index=0):
-    # Get all buttons
-    accept_buttons = get_buttons(class_name="accept-icon")
+        found.click()
+        return WebDriverWait(driver, MESSAGE_TIMEOUT, ignored_exceptions=[StaleElementReferenceException]).until(
+            find_accept_outcome
+        )
 
-    if not accept_buttons:
-        notify_admin(f"Failed to accept - accept buttons were not found. Trying again")
-        raise TemporaryError("Accept buttons missing")  
-    
-    if job_index >= len(accept_buttons):
-        raise TemporaryError(f"Job index {job_index} out of range - only {len(accept_buttons)} jobs available")
+    except TimeoutException as e:
+        notify_admin("Message didn't appear after page reload - something might be wrong")
+        raise TemporaryError(f"Message didn't appear after page reload: {e}")
 
-    button = accept_buttons[job_index]
+    except Exception as e:
+        notify_admin(f"Other error checking for the message: {e}")
+        raise TemporaryError(f"Message didn't appear after page reload: {e}")
 
-    if not button.is_displayed() or not button.is_enabled():
-        print(f"Button {job_index} is found but not active")
-        raise TemporaryError(f"Accept button {job_index} is not active.")
-    
+def accept_job(job):
+    """Accepts the job whose row matches `job` in a single async script and returns {"status", "message"}"""
     driver = get_driver()
-    driver.execute_script("arguments[0].click();", button)
+    # Leave some headroom over the in-page timeouts, then put the driver's timeout back
+    previous_timeout = driver.timeouts.script
+    driver.set_script_timeout(CONFIRM_TIMEOUT + MESSAGE_TIMEOUT + 10)
 
     try:
-        driver.execute_script("arguments[0].click();", button)
-        print("JavaScript click executed successfully")
-    except Exception as e:
-        raise TemporaryError(f"Unexpected error during accept job click: {e}")
-    
-def click_confirm_accept():
-    # Using WebDriverWait since page changed after click accept
-    try:
-        confirm_btn = WebDriverWait(get_driver(), 45).until(
-            EC.element_to_be_clickable((By.ID, "confirm-dialog"))
+        result = driver.execute_async_script(
+            ACCEPT_JOB_SCRIPT, os.getenv("JOB_TABLE_ID", "parent-table-desktop-available"), job,
+            ACCEPT_SUCCESS_TEXT, ACCEPT_GONE_TEXT, CONFIRM_TIMEOUT * 1000, MESSAGE_TIMEOUT * 1000
         )
-        confirm_btn.click()
-    except TimeoutException:
-        raise TemporaryError("Confirmation button did not appear within 30 seconds")
+    except TimeoutException as e:
+        raise TemporaryError(f"Accept script timed out: {e}")
     except Exception as e:
-        raise TemporaryError(f"Failed to click confirmation button: {e}")
+        if "document unloaded" in str(e):
+            # A click navigated the page and killed the script - the job may already be accepted,
+            # so check for the outcome instead of retrying the accept
+            print("Page reloaded during accept script, checking for outcome message")
+            result = wait_for_accept_outcome()
+        else:
+            notify_admin(f"Other error during accept job script: {e}")
+            raise TemporaryError(f"Unexpected error during accept job script: {e}")
+    finally:
+        driver.set_script_timeout(previous_timeout)
+
+    print(f"Accept result: {result}")
+    status = result.get("status")
+
+    if status == "no_buttons":
+        notify_admin("Failed to accept - accept buttons were not found. Trying again")
+    elif status == "no_message":
+        notify_admin("Message didn't appear - something might be wrong")
+
+    # not_found is returned so the caller can move on to the next job
+    if status not in ("accepted", "gone", "not_found"):
+        raise TemporaryError(result.get("message"))
+
+    return result
 
 def accept_first_job(jobs):
     # Do not accept unwanted dates
@@ -202,7 +293,8 @@ def accept_first_job(jobs):
     date_today = now.strftime("%m/%d/%Y")
     print(date_today) 
 
-    # Convert set to list so we can iterate in order
+    # Convert set to list so we can iterate - order does not match the table,
+    # accept_job() finds the row by its text
     job_list = list(jobs)
 
     for i, job in enumerate(job_list):
@@ -238,10 +330,16 @@ def accept_first_job(jobs):
         # If this job passes all filters, accept it
         print(f"Accepting job {i+1}")
         try:
-            click_accept(i)  # click the accept button for job at index i
-            time.sleep(5)  # Give time for confirmation dialog
-            click_confirm_accept()
-            confirm_job_accept()
+            result = accept_job(job)  # accept and confirm the row matching this job
+
+            if result["status"] == "not_found":
+                print(f"Job {i+1} row not found, trying next job: {result['message']}")
+                continue
+
+            if result["status"] == "accepted":
+                screenshot_and_notify("Accept button confirmed", "accept_confirmed.png", notify_users)
+            else:
+                screenshot_and_notify("Job is no longer available", "job_gone.png", notify_users)
 
             message = "Accept button clicked"
             screenshot_name = "accept_clicked.png"